@@ -1,17 +1,14 @@
 import asyncio
 import os
 import shutil
-import time
-import json
 from pathlib import Path
-from typing import Annotated
 from watchfiles import awatch, Change
 from loguru import logger
 
 from tostr.llm import GeminiClient
 from tostr.core import Registry, tost, Verbosity, BaseParser, SQLiteCache, BaseCodeStruct
 
-from tostr.exceptions import APIKeyError, StructNotFoundError, ResolveError, DatabaseNotFoundError, TargetFileNotFoundError
+from tostr.exceptions import APIKeyError, StructNotFoundError, DatabaseNotFoundError
 
 def _verify_db_exists(target_path: Path):
     if not os.path.exists(target_path):
@@ -62,7 +59,7 @@ async def inspect_async(struct_id:str, project_path: Path, include_body: bool =
     if struct_obj is None:
         raise StructNotFoundError(f"Struct not found with id {struct_id}.")
     
-    logger.debug(f"{struct_obj.uid}'s children: {[str(child) for child in struct_obj.all_children]}")
+    logger.opt(lazy=True).debug("{}'s children: {}", lambda: struct_obj.uid, lambda: [str(child) for child in struct_obj.all_children])
     
     tost_string = tost.dump(struct_obj, verbosity=Verbosity.VERBOSE, include_body=include_body, pretty=pretty)
     if isinstance(struct_obj, BaseCodeStruct):
@@ -80,7 +77,8 @@ async def skeleton_async(subpath: str, project_path: Path, pretty: bool = True):
     # relative_subpath = registry.relative_to_project(subpath)
     logger.debug(f"Loading subtree for relative path: {relative_subpath}")
     
-    registry.load_filepath(relative_subpath)
+    # the skeleton only renders signatures, so bodies are never loaded
+    registry.load_filepath(relative_subpath, include_body=False)
     if not registry.files:
         raise FileNotFoundError(f"No files found matching path '{subpath}'.")
     
@@ -129,6 +127,9 @@ async def process_single_file(project_dir: Path, filepath: Path, llm_client: Gem
         parser = BaseParser(filepath, llm_client, registry)
         
         parser.parse_path(filepath)
+        if registry.root is None:
+            # not a language tostr can parse
+            return
         
         parser.resolve_dependencies()
         
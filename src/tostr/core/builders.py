@@ -1,5 +1,3 @@
-from tree_sitter import Language, Parser
-from abc import ABC, abstractmethod
 from pathlib import Path
 from typing import TYPE_CHECKING
 
@@ -8,7 +6,7 @@ from tostr.core.models import *
 if TYPE_CHECKING:
     from tostr.core.registry import Registry
 
-class BaseBuilder(ABC):
+class BaseBuilder:
     def __init__(self, registry: Registry):
         self.registry = registry
     
@@ -30,16 +28,19 @@ class BaseBuilder(ABC):
     
     def build_directory(self) -> "DirectoryBuilder": return DirectoryBuilder(self.registry)
     
-class BaseStructBuilder(ABC):
+class BaseStructBuilder:
     def __init__(self, registry: Registry):
         self.registry = registry
         
-    @abstractmethod
-    def from_dict(self, d: dict) -> BaseStruct: pass
+    def from_dict(self, d: dict) -> BaseStruct: raise NotImplementedError
 
 class BaseFileBuilder(BaseStructBuilder):
+    
+    def prefetch(self, path: Path) -> Optional[bytes]:
+        """Thread-safe work for from_path (reading, parsing) that the parser may run ahead on a worker thread. Returns the source it read, if any, to be handed back to from_path."""
+        return None
         
-    def from_path(self, path: Path, parent: BaseStruct=None) -> BaseFile:
+    def from_path(self, path: Path, parent: BaseStruct=None, source: Optional[bytes] = None) -> BaseFile:
         rel_path = self.registry.relative_to_project(path)
         # logger.debug(f"Building File from path: {rel_path}")
         file_obj = BaseFile(
@@ -81,8 +82,8 @@ class BaseClassBuilder(BaseCodeStructBuilder):
             registry=self.registry,
             description=d.get("description", ""),
             signature=d.get("signature", ""),
-            body=d.get("body", ""),
-            diff_hash=d.get("diff_hash", ""),
+            _body=d.get("body", ""),
+            _diff_hash=d.get("diff_hash", ""),
             start_line=d.get("start_line", 0),
             end_line=d.get("end_line", 0),
             inherits=d.get("inherits", []),
@@ -102,8 +103,8 @@ class BaseMethodBuilder(BaseCodeStructBuilder):
             registry=self.registry,
             description=d.get("description", ""),
             signature=d.get("signature", ""),
-            body=d.get("body", ""),
-            diff_hash=d.get("diff_hash", ""),
+            _body=d.get("body", ""),
+            _diff_hash=d.get("diff_hash", ""),
             start_line=d.get("start_line", 0),
             end_line=d.get("end_line", 0),
             arity=d.get("arity", 0),
@@ -122,8 +123,8 @@ class BaseFieldBuilder(BaseCodeStructBuilder):
             registry=self.registry,
             description=d.get("description", ""),
             signature=d.get("signature", ""),
-            body=d.get("body", ""),
-            diff_hash=d.get("diff_hash", ""),
+            _body=d.get("body", ""),
+            _diff_hash=d.get("diff_hash", ""),
             start_line=d.get("start_line", 0),
             end_line=d.get("end_line", 0),
             _inbound_dependency_strings=json.loads(d.get("inbound_dependency_strings", [])),
@@ -1,5 +1,4 @@
 import sqlite3
-import json
 from pathlib import Path
 from contextlib import contextmanager
 
@@ -73,6 +72,7 @@ class SQLiteCache:
             # INDEXES FOR GRAPH TRAVERSAL
             conn.execute("CREATE INDEX IF NOT EXISTS idx_structs_uid ON structs(uid)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_structs_type ON structs(type)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_structs_diff_hash ON structs(diff_hash)")
             
             conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_source ON edges(source_id)")
             conn.execute("CREATE INDEX IF NOT EXISTS idx_edges_target ON edges(target_id)")
@@ -1,11 +1,12 @@
 from dataclasses import dataclass, field
-from abc import ABC, abstractmethod
+from collections import defaultdict
+from functools import lru_cache
+from operator import attrgetter
 from typing import Set, List, Dict, Any, Optional, TYPE_CHECKING, ClassVar
-import re
 import json
 import asyncio
 import hashlib
-from importlib import import_module
+import os
 from pathlib import Path
 
 from loguru import logger
@@ -15,8 +16,20 @@ from tostr.exceptions import LanguageNotSupportedError
 if TYPE_CHECKING:
     from tostr.core.registry import Registry
 
-@dataclass(eq=False)
-class BaseStruct(ABC):
+# stripped from bodies before hashing so formatting-only edits keep the same diff_hash; ascii only, so unicode
+# whitespace (nbsp, \x1c-\x1f, ...) stays in the hash, unlike the str.split() normalization used before
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+# dependency sets iterate in hash order, which changes with every run's string hash seed; listing them by uid keeps output stable
+_by_uid = attrgetter("uid")
+
+@lru_cache(maxsize=4096)
+def _resolved_path(path: Path, cwd: str) -> str:
+    # every member of a file shares its Path, so resolve (a realpath syscall walk) once per file and working directory
+    return str(path.resolve())
+
+@dataclass(eq=False, slots=True)
+class BaseStruct:
     # IDENTITY
     name: str = ""              # exampleMethod
     uid: str = ""               # namespace.exampleClass#exampleMethod(num1: int) or src/com/example/Example.java
@@ -32,13 +45,13 @@ class BaseStruct(ABC):
     _inbound_dependency_strings: List[str] = field(default_factory=list)
     @property
     def inbound_dependency_strings(self):
-        if not self._inbound_dependency_strings: self._inbound_dependency_strings = [f"{dep.id}|{dep.uid}" for dep in self.inbound_dependencies] + ['~'+f"{dep.id}|{dep.uid}" for dep in self.inbound_dependencies_fuzzy]
+        if not self._inbound_dependency_strings: self._inbound_dependency_strings = [f"{dep.id}|{dep.uid}" for dep in sorted(self.inbound_dependencies, key=_by_uid)] + ['~'+f"{dep.id}|{dep.uid}" for dep in sorted(self.inbound_dependencies_fuzzy, key=_by_uid)]
         return self._inbound_dependency_strings
     
     _outbound_dependency_strings: List[str] = field(default_factory=list)
     @property
     def outbound_dependency_strings(self):
-        if not self._outbound_dependency_strings: self._outbound_dependency_strings = [f"{dep.id}|{dep.uid}" for dep in self.outbound_dependencies] + ['~'+f"{dep.id}|{dep.uid}" for dep in self.outbound_dependencies_fuzzy]
+        if not self._outbound_dependency_strings: self._outbound_dependency_strings = [f"{dep.id}|{dep.uid}" for dep in sorted(self.outbound_dependencies, key=_by_uid)] + ['~'+f"{dep.id}|{dep.uid}" for dep in sorted(self.outbound_dependencies_fuzzy, key=_by_uid)]
         return self._outbound_dependency_strings
     
     inbound_dependency_names: Set[str] = field(default_factory=set) # for serialization only, not used for resolution
@@ -61,25 +74,26 @@ class BaseStruct(ABC):
             self._all_children.extend(child_set)
         return self._all_children
     
+    # children are bucketed by type name in add_child, so each typed view is read straight from its bucket
     @property
     def directories(self):
-        return [child for child in self.all_children if isinstance(child, Directory)]
+        return list(self.children.get("Directory", ()))
     
     @property
     def files(self):
-        return list(self.children.get("BaseFile", set()))
+        return list(self.children.get("BaseFile", ()))
     
     @property
     def methods(self):
-        return [child for child in self.all_children if isinstance(child, BaseMethod)]
+        return list(self.children.get("BaseMethod", ()))
     
     @property
     def fields(self):
-        return [child for child in self.all_children if isinstance(child, BaseField)]
+        return list(self.children.get("BaseField", ()))
     
     @property
     def classes(self):
-        return [child for child in self.all_children if isinstance(child, BaseClass)]
+        return list(self.children.get("BaseClass", ()))
     
     @property
     def edges(self):
@@ -112,10 +126,11 @@ class BaseStruct(ABC):
     def add_child(self, child: "BaseStruct"):
         type_name = child.__class__.__name__ # e.g., "BaseMethod"
         
-        if type_name not in self.children:
-            self.children[type_name] = set()
-            
-        self.children[type_name].add(child)
+        bucket = self.children.get(type_name)
+        if bucket is None:
+            bucket = self.children[type_name] = set()
+        bucket.add(child)
+        self._all_children = [] # rebuilt lazily by all_children
         child.set_parent(self)
     
     def set_parent(self, parent: "BaseStruct"):
@@ -148,9 +163,8 @@ class BaseStruct(ABC):
             for child in child_set:
                 child.resolve_dependencies()
     
-    @abstractmethod
     async def resolve_description_async(self, llm: "LLMClient", visited: set[str] = None):
-        pass
+        raise NotImplementedError
     
     @classmethod
     def from_dict(cls, d: dict):
@@ -168,7 +182,7 @@ class BaseStruct(ABC):
             "name": self.name,
             "uid": self.uid,
             "type": "BaseStruct",
-            "path": str(self.path.resolve()),
+            "path": _resolved_path(self.path, os.getcwd()),
             "description": self.description,
             "inbound_dependency_strings": self.inbound_dependency_strings,
             "outbound_dependency_strings": self.outbound_dependency_strings,
@@ -188,9 +202,10 @@ class BaseStruct(ABC):
     
     def __str__(self):
         return f"<{self.__class__.__name__}: {self.uid}>"
+    # subclasses pass repr=False to keep this rather than a generated repr that walks parent, registry and children
     __repr__=__str__
     
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True, repr=False)
 class Directory(BaseStruct):
     _IDPREFIX: ClassVar[str] = "D"
     
@@ -200,7 +215,8 @@ class Directory(BaseStruct):
     async def resolve_description_async(self, llm: "LLMClient", visited: set[str] = None):
         pass
     
-    def parse_children(self):
+    def parse_children(self, files: Optional[List[tuple[Path, "Directory"]]] = None):
+        """Builds child directories and files. When files is given, file paths are collected into it with their parent instead of being built."""
         if self.path is None:
             logger.error(f"{self} has no path")
             return
@@ -208,14 +224,16 @@ class Directory(BaseStruct):
                 if any(part in path.parts for part in ["venv", ".venv", "env", ".env", "build", "dist", "__pycache__", ".tostr", ".DS_Store", ".git"]):
                     continue
                 if path.is_dir():
-                    logger.debug(f"🔍 Parsing directory '{path}'")
+                    logger.debug("🔍 Parsing directory '{}'", path)
                     relative_path = self.registry.relative_to_project(path)
                     directory = Directory(path=relative_path, registry=self.registry, parent=self)
                     self.registry.add_struct(directory)
                     self.add_child(directory)
-                    directory.parse_children()
+                    directory.parse_children(files)
+                elif files is not None:
+                    files.append((path, self))
                 else:
-                    logger.debug(f"Attempting to resolve builder for suffix {path.parts[-1]}")
+                    logger.debug("Attempting to resolve builder for suffix {}", path.parts[-1])
                     try:
                         builder = StructBuilderProvider.get_builder(path.suffix, self.registry)
                     except LanguageNotSupportedError as e:
@@ -229,7 +247,7 @@ class Directory(BaseStruct):
         data["type"] = "Directory"
         return data
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True, repr=False)
 class BaseFile(BaseStruct):
     _IDPREFIX: ClassVar[str] = "F"
     
@@ -238,9 +256,25 @@ class BaseFile(BaseStruct):
     body: str = ""
     node: "Node" = None
     
+    _import_index: Set[str] = field(init=False, repr=False, default_factory=set)
+    @property
+    def import_index(self) -> Set[str]:
+        # full imports (wildcards as "a.b.*"), built once per file instead of rescanning imports for every call site
+        if not self._import_index: self._import_index = set(self.imports)
+        return self._import_index
+    
+    def walk_classes(self):
+        """Yields every class in the file, nested classes included."""
+        stack = self.classes
+        while stack:
+            class_obj = stack.pop()
+            yield class_obj
+            stack.extend(class_obj.children.get("BaseClass", ()))
+    
     async def resolve_description_async(self, llm: "LLMClient", visited: set[str] = None):
-        for child in self.all_children:
-            await child.resolve_description_async(llm, visited)
+        # each class is its own LLM request, so schedule the whole class tree in one gather; the client's semaphore bounds the fan-out
+        if visited is None: visited = set()
+        await asyncio.gather(*(c.resolve_description_async(llm, visited) for c in self.walk_classes() if c.uid not in visited))
     
     def to_dict(self) -> dict:
         data = super().to_dict()
@@ -249,12 +283,23 @@ class BaseFile(BaseStruct):
         data["body"] = self.body
         return data
     
-@dataclass(eq=False) 
+@dataclass(eq=False, slots=True, repr=False)
 class BaseCodeStruct(BaseStruct):
     
     signature: str = ""         # public static int add(int num1, int num2) or class <T> Example extends BaseClass
-    body: str = ""              # signature + method body or class body for hashing and LLM context
-    diff_hash: str = ""         # hash of the code body - whitespace for change detection
+    _body: str = ""             # signature + method body or class body for hashing and LLM context
+    @property
+    def body(self) -> str:
+        # sliced from the tree's shared source on first access instead of holding a copy per struct
+        if not self._body and self.node is not None: self._body = self.node.text.decode('utf-8')
+        return self._body
+    
+    _diff_hash: str = ""        # hash of the code body - whitespace for change detection
+    @property
+    def diff_hash(self) -> str:
+        # structs hydrated from the cache keep their stored hash, parsed ones hash their source on first access
+        if not self._diff_hash and self.node is not None: self._diff_hash = hashlib.sha256(self.node.text.translate(None, _ASCII_WHITESPACE)).hexdigest()
+        return self._diff_hash
     start_line: int = 0         
     end_line: int = 0
     node: "Node" = None         # Optional reference to the tree-sitter node for advanced processing (e.g., skeletonization)
@@ -269,11 +314,12 @@ class BaseCodeStruct(BaseStruct):
         data["end_line"] = self.end_line
         return data
     
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True, repr=False)
 class BaseClass(BaseCodeStruct):
     _IDPREFIX: ClassVar[str] = "C"
     enum_constants: Optional[List[str]] = None
     inherits: List[str] = field(default_factory=list) # list of parent class UIDs for inheritance relationships
+    _qualified_name: str = field(init=False, repr=False, default="")
     
     @property
     def needs_description(self) -> bool:
@@ -289,6 +335,22 @@ class BaseClass(BaseCodeStruct):
     def imports(self) -> List[str]:
         return self.parent.imports
     
+    @property
+    def import_index(self) -> Set[str]:
+        return self.parent.import_index
+    
+    @property
+    def qualified_name(self) -> str:
+        """The class name as an import spells it, e.g. 'a.b.Outer.Inner'."""
+        if not self._qualified_name:
+            parent = self.parent
+            if isinstance(parent, BaseClass):
+                prefix = parent.qualified_name
+            else:
+                prefix = getattr(parent, "package", "")
+            self._qualified_name = f"{prefix}.{self.name}" if prefix else self.name
+        return self._qualified_name
+    
     def resolve_dependencies(self):
         # logger.debug(f"Resolving dependencies for {self}")
         # resolve child dependencies
@@ -314,6 +376,8 @@ class BaseClass(BaseCodeStruct):
     def skeletonize(self) -> str:
         if not hasattr(self, 'node') or not self.node:
             raise ValueError("Node reference is required for skeletonization.")
+        # the serializer imports this module, so it can only be imported once both are loaded
+        from tostr.core.serializer import tost, Verbosity
         
         result_bytes = self.node.text
         start_byte = self.node.start_byte
@@ -330,7 +394,7 @@ class BaseClass(BaseCodeStruct):
             
             rel_start = child.node.start_byte - start_byte
             rel_end = child.node.end_byte - start_byte
-            method_skeleton = tost.dump(child, verbosity=tost.VERBOSITY.SKELETON, pretty=False)
+            method_skeleton = tost.dump(child, verbosity=Verbosity.SKELETON, pretty=False)
             skeleton_bytes = method_skeleton.encode('utf-8')
             result_bytes = result_bytes[:rel_start] + skeleton_bytes + result_bytes[rel_end:]
             
@@ -351,7 +415,10 @@ class BaseClass(BaseCodeStruct):
         except Exception as e:
             logger.error(f"Failed to generate description for {self.uid}: {e}")
             return
-            
+        self.apply_description(response_obj)
+    
+    def apply_description(self, response_obj: Optional[dict]):
+        """Copies an LLM description response onto this class and the children it names."""
         try:
             if not response_obj or response_obj.get("status") == "error":
                 error_msg = response_obj.get('error') if response_obj else 'Returned None in'
@@ -367,7 +434,7 @@ class BaseClass(BaseCodeStruct):
                 returned_methods = {child['uid']: child for child in response_obj.get("methods", [])}
             except KeyError:
                 logger.warning(f"⚠️ Missing methods for {self.uid} in LLM response or failed to index by 'uid'")
-                logger.debug(f"LLM response for {self.uid}: {response_obj}")
+                logger.debug("LLM response for {}: {}", self.uid, response_obj)
                 return
             
             for child_set in self.children.values():
@@ -389,7 +456,7 @@ class BaseClass(BaseCodeStruct):
         data["inherits"] = self.inherits
         return data
     
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True, repr=False)
 class BaseMethod(BaseCodeStruct):
     _IDPREFIX: ClassVar[str] = "M"
     
@@ -403,6 +470,13 @@ class BaseMethod(BaseCodeStruct):
     #     pass
     
     def resolve_dependencies(self):
+        if not self.dependency_names:
+            return
+        # looked up once per method rather than once per dependency
+        methods_by_signature = self.registry.methods_by_signature
+        import_index = self.parent.import_index
+        inherited_names = [parent_class.split('.')[-1] for parent_class in self.parent.inherits]
+        
         for name, arity in self.dependency_names:
             # LOCAL
             for child_set in self.children.values():
@@ -411,21 +485,29 @@ class BaseMethod(BaseCodeStruct):
                         self.add_dependency(child)
                         break
             
+            # one (name, arity) bucket per dependency, narrowed by parent below; read in place rather than copied, nothing here mutates it
+            named_candidates = methods_by_signature.get((name, arity))
+            if not named_candidates:
+                continue
+            
             # IMPORTED
-            for imp in self.parent.imports:
-                import_name = f"{imp}#{name}"
-                candidates = self.registry.resolve_methods(name=name, arity=arity, parent_name=import_name)
+            imported_candidates = defaultdict(list)
+            for c in named_candidates:
+                owner = c.parent.qualified_name
+                # the class itself, a wildcard over its package (or enclosing class), or a static import of its members
+                if (owner in import_index or f"{owner.rpartition('.')[0]}.*" in import_index
+                        or f"{owner}.*" in import_index or f"{owner}.{name}" in import_index):
+                    imported_candidates[owner].append(c)
+            for candidates in imported_candidates.values():
                 if len(candidates) == 1:
                     self.add_dependency(candidates[0])
-                elif len(candidates) > 1:
+                else:
                     for c in candidates:
                         self.add_fuzzy_dependency(c)
             
             # INHERITED
-            for parent_class in self.parent.inherits:
-                parent_name = parent_class.split('.')[-1]
-                # TODO: implement resolve_methods_by_name in registry
-                candidates = self.registry.resolve_methods(name=name, arity=arity, parent_name=parent_name)
+            for parent_name in inherited_names:
+                candidates = [c for c in named_candidates if c.parent.name == parent_name]
                 if len(candidates) == 1:
                     self.add_dependency(candidates[0])
                 elif len(candidates) > 1:
@@ -441,7 +523,7 @@ class BaseMethod(BaseCodeStruct):
         data["arity"] = self.arity
         return data
 
-@dataclass(eq=False)
+@dataclass(eq=False, slots=True, repr=False)
 class BaseField(BaseCodeStruct):
     _IDPREFIX: ClassVar[str] = "V"
     
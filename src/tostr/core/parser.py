@@ -1,29 +1,32 @@
 from pathlib import Path
-from abc import ABC, abstractmethod
-from collections import defaultdict
-import asyncio
-import json
-import time
 from collections import deque
+from typing import Iterator
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from loguru import logger
 
-from tostr.core.models import BaseFile, Directory
+from tostr.core.models import BaseStruct, BaseFile, BaseClass, Directory
 from tostr.core.registry import Registry
-from tostr.core.serializer import tost, Verbosity
 from tostr.core.providers import StructBuilderProvider
 from tostr.exceptions import LanguageNotSupportedError
 
-class BaseParser(ABC):
+class BaseParser:
+    # files read and parsed ahead of the builder, kept below the java tree cache size so prefetched trees are not evicted
+    _PREFETCH_WINDOW: int = 64
+    # classes are packed into one description request up to this many classes / source bytes
+    _DESCRIPTION_BATCH_SIZE: int = 8
+    _DESCRIPTION_BATCH_BYTES: int = 12000
+    # concurrent description requests, matching the Gemini client's in-flight limit
+    _DESCRIPTION_WORKERS: int = 200
+    
     def __init__(self, project_dir: str, llm=None, registry: Registry=None):
         self.llm = llm
         self.registry = registry
         self.path_ignore = ["venv", ".venv", "env", ".env", "build", "dist", "__pycache__", ".tostr", ".git"]
     
     @property
-    def files(self):
-        if self._files: return self._files
-        self._files = self.registry.uid_map.values().filter(lambda x: isinstance(x, BaseFile))
-        return self._files
+    def files(self) -> list[BaseFile]:
+        return self.registry.files
     
     async def parse(self, subpath: Path = None):
         if not subpath:
@@ -39,37 +42,72 @@ class BaseParser(ABC):
         
     def parse_path(self, subpath: Path = None):
         if subpath.is_dir():
-            logger.debug(f"🔍 Parsing files in '{subpath}'")
+            logger.debug("🔍 Parsing files in '{}'", subpath)
             root = Directory(path=subpath, registry=self.registry)
             self.registry.root = root
-            logger.debug(f"Created registry root: {root}")
+            logger.debug("Created registry root: {}", root)
             self.registry.add_struct(root)
+            files = []
             for path in subpath.glob("*"):
                 if any(part in path.parts for part in self.path_ignore):
                     continue
                 if path.is_dir():
-                    logger.debug(f"🔍 Parsing directory '{path}'")
+                    logger.debug("🔍 Parsing directory '{}'", path)
                     relative_path = path.resolve().relative_to(self.registry.project_path.resolve())
                     # relative_path = self.registry.relative_to_project(path)
                     directory = Directory(path=relative_path, registry=self.registry, parent=root)
                     self.registry.add_struct(directory)
                     root.add_child(directory)
-                    directory.parse_children()
+                    directory.parse_children(files)
                 else:
-                    logger.debug(f"🔍 Parsing file '{path}'")
-                    file = self.parse_file(path, parent=root)
-                    if file:
-                        self.registry.add_struct(file)
-                        root.add_child(file)
+                    files.append((path, root))
+            self.build_files(files)
+            self.registry.restore_cached_descriptions()
         else:
-            logger.debug(f"🔍 Parsing file '{subpath}'")
+            logger.debug("🔍 Parsing file '{}'", subpath)
             file = self.parse_file(subpath)
+            if file is None:
+                logger.debug("No builder for '{}', skipping", subpath)
+                return
             self.registry.root = file
             self.registry.add_struct(file)
+            self.registry.restore_cached_descriptions(uid_prefix=file.uid)
 
+    def build_files(self, files: list[tuple[Path, BaseStruct]]):
+        """Builds file structs in walk order while a thread pool reads and parses the next files ahead of the builder."""
+        entries = iter(files)
+        pending = deque()
+        # file builders hold no per-file state, so one per suffix serves every file (None marks unsupported suffixes)
+        file_builders = {}
+        with ThreadPoolExecutor() as pool:
+            def submit_next():
+                for path, parent in entries:
+                    suffix = path.suffix
+                    if suffix not in file_builders:
+                        try:
+                            file_builders[suffix] = StructBuilderProvider.get_builder(suffix, self.registry).build_file()
+                        except LanguageNotSupportedError:
+                            file_builders[suffix] = None
+                    file_builder = file_builders[suffix]
+                    if file_builder is None:
+                        continue
+                    pending.append((path, parent, file_builder, pool.submit(file_builder.prefetch, path)))
+                    return
+            
+            for _ in range(self._PREFETCH_WINDOW):
+                submit_next()
+            while pending:
+                path, parent, file_builder, prefetched = pending.popleft()
+                submit_next()
+                source = prefetched.result()
+                logger.debug("🔍 Parsing file '{}'", path)
+                file = file_builder.from_path(path, parent=parent, source=source)
+                self.registry.add_struct(file)
+                parent.add_child(file)
+    
     # @abstractmethod
     def parse_file(self, subpath: Path, parent: BaseStruct=None) -> BaseFile:
-        logger.debug(f"Attempting to resolve builder for suffix {subpath.parts[-1]}")
+        logger.debug("Attempting to resolve builder for suffix {}", subpath.parts[-1])
         try:
             builder = StructBuilderProvider.get_builder(subpath.suffix, self.registry)
         except LanguageNotSupportedError as e:
@@ -89,9 +127,78 @@ class BaseParser(ABC):
                     
     async def resolve_descriptions_async(self):
         self.visited_ucids = set()
-        coroutine_list = [file.resolve_description_async(self.llm, self.visited_ucids) for file in self.registry.files]
-        if coroutine_list == []: return
-        result = await asyncio.gather(*coroutine_list)
+        if hasattr(self.llm, "generate_descriptions_batch"):
+            await self._resolve_descriptions_batched()
+        else:
+            coroutine_list = [file.resolve_description_async(self.llm, self.visited_ucids) for file in self.registry.files]
+            if coroutine_list:
+                await asyncio.gather(*coroutine_list)
+        # bodies duplicated across the project were described once; their copies take the same description
+        self.registry.share_descriptions()
+    
+    async def _resolve_descriptions_batched(self):
+        """Packs small classes into shared LLM requests so their fixed per-request cost is paid once per batch."""
+        batches = []
+        batch, batch_bytes = [], 0
+        # a class identical to one already queued is left to registry.share_descriptions
+        queued_hashes = set()
+        for file in self.registry.files:
+            for class_obj in file.walk_classes():
+                if class_obj.uid in self.visited_ucids or not class_obj.needs_description:
+                    continue
+                self.visited_ucids.add(class_obj.uid)
+                diff_hash = class_obj.diff_hash
+                if diff_hash in queued_hashes:
+                    continue
+                if diff_hash:
+                    queued_hashes.add(diff_hash)
+                node = class_obj.node
+                class_bytes = node.end_byte - node.start_byte if node is not None else len(class_obj.body.encode("utf-8"))
+                if class_bytes > self._DESCRIPTION_BATCH_BYTES:
+                    # too large to share a request, described on its own
+                    batches.append([class_obj])
+                    continue
+                # a nested class's source is already part of its outer class's payload, so the two never share a request
+                outer = class_obj.parent
+                while isinstance(outer, BaseClass) and outer not in batch:
+                    outer = outer.parent
+                if isinstance(outer, BaseClass) or len(batch) == self._DESCRIPTION_BATCH_SIZE or batch_bytes + class_bytes > self._DESCRIPTION_BATCH_BYTES:
+                    batches.append(batch)
+                    batch, batch_bytes = [], 0
+                batch.append(class_obj)
+                batch_bytes += class_bytes
+        if batch:
+            batches.append(batch)
+        # a fixed pool of workers drains the batches, so only as many requests exist as can be in flight at once
+        pending = iter(batches)
+        await asyncio.gather(*(self._describe_batches(pending) for _ in range(min(self._DESCRIPTION_WORKERS, len(batches)))))
+    
+    async def _describe_batches(self, batches: Iterator[list[BaseClass]]):
+        for batch in batches:
+            await self._describe_batch(batch)
+    
+    async def _describe_batch(self, classes: list[BaseClass]):
+        try:
+            if len(classes) == 1:
+                responses = [await self.llm.generate_description(classes[0], classes[0].imports)]
+            else:
+                try:
+                    responses = await self.llm.generate_descriptions_batch(classes)
+                except Exception as e:
+                    logger.warning(f"Batch description failed for {[c.uid for c in classes]}, describing them one by one: {e}")
+                    responses = [None] * len(classes)
+            # a class left out of the batch answer (or echoed back under the wrong uid) gets a request of its own
+            missing = [i for i, response_obj in enumerate(responses) if response_obj is None]
+            if missing:
+                logger.debug("Describing {} classes missing from a batch response on their own", len(missing))
+                retried = await asyncio.gather(*(self.llm.generate_description(classes[i], classes[i].imports) for i in missing))
+                for i, response_obj in zip(missing, retried):
+                    responses[i] = response_obj
+        except Exception as e:
+            logger.error(f"Failed to generate descriptions for {[c.uid for c in classes]}: {e}")
+            return
+        for class_obj, response_obj in zip(classes, responses):
+            class_obj.apply_description(response_obj)
         
         
     # def write_skeleton(self):
@@ -1,24 +1,31 @@
-from pathlib import Path
 from importlib import import_module
+from typing import TYPE_CHECKING
 from loguru import logger
 
 from tostr.exceptions import LanguageNotSupportedError
 
+if TYPE_CHECKING:
+    from tostr.core.registry import Registry
+    from tostr.core.builders import BaseBuilder
+
 class StructBuilderProvider:
     builder_map = {
         ".java": ("java", "JavaBuilder"),
     }
+    # builder classes resolved from builder_map, so each language module is imported and looked up once
+    _builder_classes: dict[str, type] = {}
     
     @classmethod
-    def get_builder(cls, ext: str, registry: "MemberRegistry") -> "BaseBuilder":
-        if ext in cls.builder_map:
+    def get_builder(cls, ext: str, registry: "Registry") -> "BaseBuilder":
+        class_ref = cls._builder_classes.get(ext)
+        if class_ref is None:
+            if ext not in cls.builder_map:
+                logger.error(f"No builder found for {ext}")
+                raise LanguageNotSupportedError(f"No builder found for {ext}")
             package = f"tostr.languages.{cls.builder_map[ext][0]}"
             class_name = cls.builder_map[ext][1]
-            class_ref = getattr(import_module(package), class_name)
-            return class_ref(registry)
-        else:
-            logger.error(f"No builder found for {ext}")
-            raise LanguageNotSupportedError(f"No builder found for {ext}")
+            class_ref = cls._builder_classes[ext] = getattr(import_module(package), class_name)
+        return class_ref(registry)
 
 
 # class ParserProvider:
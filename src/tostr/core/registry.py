@@ -1,7 +1,7 @@
 from collections import defaultdict
-from typing import List, Dict, Optional, TYPE_CHECKING
+from typing import List, Dict, Set, Optional, Tuple, TYPE_CHECKING
 from pathlib import Path
-from tostr.core.models import BaseFile, BaseClass, BaseMethod, BaseField
+from tostr.core.models import BaseFile, BaseCodeStruct, BaseClass, BaseMethod, BaseField
 from tostr.core.db import SQLiteCache
 from tostr.core.builders import BaseBuilder
 
@@ -9,7 +9,23 @@ import json
 from loguru import logger
 
 if TYPE_CHECKING:
-    from tostr.core.models import BaseStruct, BaseCodeStruct
+    from tostr.core.models import BaseStruct
+
+# every structs column except body, for loads that only render signatures
+_BODYLESS_COLUMNS = (
+    "id, uid, name, type, path, description, inbound_dependency_strings, outbound_dependency_strings, "
+    "signature, diff_hash, start_line, end_line, imports, inherits, enum_constants, field_type, arity"
+)
+
+# stays below the 999 bound-parameter ceiling of older sqlite builds
+_SQLITE_MAX_VARIABLES = 900
+
+def _serialize_for_db(value):
+    if isinstance(value, (dict, list, tuple, set)):
+        if isinstance(value, set):
+            value = list(value)
+        return json.dumps(value)
+    return value
 
 class Registry:
     def __init__(self, use_cache: bool = True, db: SQLiteCache = None, project_path: Path = None):
@@ -19,10 +35,16 @@ class Registry:
         self.id_map: Dict[str, BaseStruct] = {}
         self.root: Optional[BaseStruct] = None
         self.db = db
+        # (name, arity) -> methods, kept in step with uid_map by add_struct
+        self.methods_by_signature: Dict[Tuple[str, int], List[BaseMethod]] = defaultdict(list)
+        # files grouped as they are added, so callers never rescan uid_map for them
+        self.files_by_uid: Dict[str, BaseFile] = {}
+        # uids whose description was just read back from the cache, which a stale save must not mark stale
+        self.restored_uids: Set[str] = set()
     
     @property
     def files(self) -> List[BaseFile]:
-        return [x for x in self.uid_map.values() if isinstance(x, BaseFile)]
+        return list(self.files_by_uid.values())
     
     @property
     def classes(self) -> List[BaseClass]:
@@ -52,26 +74,43 @@ class Registry:
     
     def add_struct(self, struct: BaseStruct):
         """ Adds a struct to the in-memory cache """
+        previous = self.uid_map.get(struct.uid)
+        if isinstance(previous, BaseMethod):
+            bucket = self.methods_by_signature[(previous.name, previous.arity)]
+            if previous in bucket:
+                bucket.remove(previous)
+        elif isinstance(previous, BaseFile) and not isinstance(struct, BaseFile):
+            del self.files_by_uid[previous.uid]
         self.uid_map[struct.uid] = struct
         self.id_map[struct.id] = struct
+        if isinstance(struct, BaseMethod):
+            self.methods_by_signature[(struct.name, struct.arity)].append(struct)
+        elif isinstance(struct, BaseFile):
+            self.files_by_uid[struct.uid] = struct
         
     def resolve_methods(self, name: str, arity: int, parent_name: Optional[str] = None):
+        candidates = self.methods_by_signature.get((name, arity), [])
         if parent_name:
-            return [x for x in self.methods if x.name == name and x.arity == arity and x.parent.name == parent_name]
-        return [x for x in self.methods if x.name == name and x.arity == arity]
+            return [x for x in candidates if x.parent.name == parent_name]
+        return list(candidates)
+    
+    def load_cache(self):
+        """ Hydrates the whole cached project, class and method descriptions included """
+        return self.load_filepath(self.project_path or Path("."))
     
-    def load_filepath(self, path: Path):
-        logger.debug(f"Loading subtree {str(path)}")
+    def load_filepath(self, path: Path, include_body: bool = True):
+        logger.debug("Loading subtree {}", path)
         path_str = str(self.relative_to_project(path))
         resolved_path_str = str(path.resolve())
+        columns = "*" if include_body else _BODYLESS_COLUMNS
         with self.db.get_connection() as conn:
             cursor = conn.cursor()
             
             # pull and hydrate structs
             if path_str != ".":
-                cursor.execute("SELECT * FROM structs WHERE path LIKE ? || '%'", (resolved_path_str,))
+                cursor.execute(f"SELECT {columns} FROM structs WHERE path LIKE ? || '%'", (resolved_path_str,))
             else:
-                cursor.execute("SELECT * FROM structs")
+                cursor.execute(f"SELECT {columns} FROM structs")
                 
             node_rows = cursor.fetchall()
             node_ids = [str(row['id']) for row in node_rows]
@@ -89,7 +128,7 @@ class Registry:
                 if instance:
                     self.add_struct(instance)
             
-            logger.debug(f"Found {len(node_rows)} structs in subtree {path_str}")
+            logger.debug("Found {} structs in subtree {}", len(node_rows), path_str)
             
             if not node_ids:
                 return None
@@ -116,7 +155,7 @@ class Registry:
             
             edge_rows = cursor.fetchall()
             
-            logger.debug(f"Found {len(edge_rows)} edges in subtree {path_str}")
+            logger.debug("Found {} edges in subtree {}", len(edge_rows), path_str)
             
             
             for source_id, target_id, edge_type in edge_rows:
@@ -131,20 +170,20 @@ class Registry:
         
         self.root = self.get_struct_by_uid(path_str)
                 
-        logger.debug(f"Loaded subtree {path_str} with root {self.root}")
+        logger.debug("Loaded subtree {} with root {}", path_str, self.root)
         
         return self.root
     
     def get_struct_by_uid(self, uid: str) -> Optional["BaseStruct"]:
-        logger.debug(f"Attempting to retrieve struct and its children with UID {uid} from registry")
+        logger.debug("Attempting to retrieve struct and its children with UID {} from registry", uid)
         
         # Check memory cache first
         if uid in self.uid_map:
-            logger.debug(f"Cache hit for UID {uid}, returning memory object")
+            logger.debug("Cache hit for UID {}, returning memory object", uid)
             return self.uid_map[uid]
 
         if not self.use_cache or not self.db:
-            logger.debug(f"Cache miss for UID {uid}, but no DB provided or caching disabled, returning None")
+            logger.debug("Cache miss for UID {}, but no DB provided or caching disabled, returning None", uid)
             return None
         
         from tostr.core.builders import BaseBuilder
@@ -165,7 +204,7 @@ class Registry:
             node_rows = cursor.fetchall()
             
             if not node_rows:
-                logger.debug(f"No structs found in DB matching UID {uid}")
+                logger.debug("No structs found in DB matching UID {}", uid)
                 return None
                 
             node_ids = [str(row['id']) for row in node_rows]
@@ -239,9 +278,10 @@ class Registry:
         # Fetch UID from db to execute localized subtree retrieval
         with self.db.get_connection() as conn:
             row = conn.execute("SELECT uid FROM structs WHERE id = ?", (id_str,)).fetchone()
-            logger.debug(f"Queried DB for struct with id {id_str}, got uid: {row[0]}")
             if not row:
+                logger.debug("Queried DB for struct with id {}, found none", id_str)
                 return None
+            logger.debug("Queried DB for struct with id {}, got uid: {}", id_str, row[0])
             
             target_uid = row[0]
             
@@ -261,6 +301,47 @@ class Registry:
                 return True
             return False
         
+    def restore_cached_descriptions(self, uid_prefix: Optional[str] = None):
+        """ Copies cached descriptions onto parsed code structs whose diff_hash matches a cached struct's, so unchanged and duplicated bodies are not regenerated """
+        if not self.use_cache or not self.db:
+            return
+        waiting = self._undescribed_by_hash(uid_prefix)
+        if not waiting:
+            return
+        hashes = list(waiting)
+        with self.db.get_connection() as conn:
+            # only rows for the waiting hashes are read, in chunks that stay under sqlite's bound-variable limit
+            for start in range(0, len(hashes), _SQLITE_MAX_VARIABLES):
+                chunk = hashes[start:start + _SQLITE_MAX_VARIABLES]
+                sql = (
+                    f"SELECT diff_hash, description FROM structs WHERE diff_hash IN ({','.join('?' * len(chunk))}) "
+                    "AND description != '' AND description NOT LIKE '[STALE]%'"
+                )
+                for diff_hash, description in conn.execute(sql, chunk):
+                    for struct in waiting.pop(diff_hash, ()):
+                        struct.description = description
+                        self.restored_uids.add(struct.uid)
+    
+    def share_descriptions(self):
+        """ Copies descriptions generated this run onto undescribed code structs with an identical body """
+        waiting = self._undescribed_by_hash()
+        if not waiting:
+            return
+        for struct in self.uid_map.values():
+            if isinstance(struct, BaseCodeStruct) and struct.description:
+                for duplicate in waiting.pop(struct.diff_hash, ()):
+                    duplicate.description = struct.description
+    
+    def _undescribed_by_hash(self, uid_prefix: Optional[str] = None) -> Dict[str, List[BaseCodeStruct]]:
+        """ Groups undescribed code structs by diff_hash; a description for any struct with the same body serves the whole group """
+        waiting = defaultdict(list)
+        for struct in self.uid_map.values():
+            if isinstance(struct, BaseCodeStruct) and not struct.description and (not uid_prefix or struct.uid.startswith(uid_prefix)):
+                diff_hash = struct.diff_hash
+                if diff_hash:
+                    waiting[diff_hash].append(struct)
+        return waiting
+        
     def update_cached_description(self, struct: BaseStruct | str):
         if not self.db:
             raise RuntimeError("Cannot check for stale structs if SqLiteCache not provided.")
@@ -309,40 +390,27 @@ class Registry:
             raise RuntimeError("Cannot save to cache if SqLiteCache not provided.")
         
         parsed_ids = [(node.id,) for node in self.uid_map.values()]
-        grouped_nodes = defaultdict(list)
+        grouped_rows = defaultdict(list)
         all_edges = set()
         
-        def serialize_for_db(value):
-            if isinstance(value, (dict, list, tuple, set)):
-                if isinstance(value, set):
-                    value = list(value)
-                return json.dumps(value)
-            return value
-        
         for node in self.uid_map.values():
             data_dict = node.to_dict()
-            if stale and data_dict.get("description", None):
+            if stale and data_dict.get("description", None) and node.uid not in self.restored_uids:
                 data_dict["description"] = f"[STALE] {data_dict['description']}"
             
-            # tuple of keys as the group identifier
-            column_footprint = tuple(data_dict.keys())
+            # tuple of keys as the group identifier; rows are built straight from the values in that same order
+            column_footprint = tuple(data_dict)
             
-            grouped_nodes[column_footprint].append(data_dict) 
+            grouped_rows[column_footprint].append(tuple(map(_serialize_for_db, data_dict.values())))
             all_edges.update(node.edges)
             
         with self.db.get_connection() as conn:
-            for columns_tuple, dict_list in grouped_nodes.items():
+            for columns_tuple, node_values in grouped_rows.items():
                 
                 columns = ", ".join(columns_tuple)
                 placeholders = ", ".join(["?"] * len(columns_tuple))
                 node_sql = f"INSERT OR REPLACE INTO structs ({columns}) VALUES ({placeholders})"
                 
-                # Fetching the specific value for each column from the dictionary
-                node_values = [
-                    tuple(serialize_for_db(n.get(col)) for col in columns_tuple)
-                    for n in dict_list
-                ]
-                
                 conn.executemany(node_sql, node_values)
             
             conn.executemany(
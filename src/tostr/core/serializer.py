@@ -1,13 +1,9 @@
-from typing import List
-
 from tostr.core.models import *
 
 from enum import IntEnum
 from loguru import logger
-import json
 
 import textwrap
-from collections import defaultdict
 
 _INDENT_TAB = "   "
 
@@ -1,13 +1,77 @@
-from tree_sitter import Parser, Node, Query, QueryCursor
+from tree_sitter import Parser, Node, Tree
+from collections import OrderedDict
 from pathlib import Path
-from typing import TYPE_CHECKING
+import hashlib
+import threading
+from sys import intern # names, types and call targets repeat across structs; interned copies are shared and compare by identity
 
 from tostr.core.registry import Registry
-from tostr.languages.java.language import JAVA_LANGUAGE
-from tostr.core.builders import BaseBuilder, BaseFileBuilder, BaseClassBuilder, BaseMethodBuilder, BaseFieldBuilder
-from tostr.languages.java.queries import DEPENDENCY_QUERY
+from tostr.languages.java.language import JAVA_LANGUAGE, JavaNodeKind, JavaFieldId
+from tostr.core.builders import BaseBuilder, BaseFileBuilder, BaseCodeStructBuilder, BaseClassBuilder, BaseMethodBuilder, BaseFieldBuilder
+from tostr.languages.java.queries import DependencyIndex
 from tostr.core.models import *
 
+# a tree-sitter Parser is not safe to share between threads, so each thread keeps its own
+_local = threading.local()
+
+def _parser() -> Parser:
+    parser = getattr(_local, "parser", None)
+    if parser is None:
+        parser = _local.parser = Parser(JAVA_LANGUAGE)
+    return parser
+
+def _node_text(node: Node, source: Optional[bytes | str] = None) -> str:
+    """Decodes a node's text, slicing the file source directly when it is available instead of copying through node.text.
+    A str source is an ascii file's decoded text, whose character offsets equal the node's byte offsets."""
+    if source is None:
+        return node.text.decode('utf-8')
+    if isinstance(source, str):
+        return source[node.start_byte:node.end_byte]
+    return source[node.start_byte:node.end_byte].decode('utf-8')
+
+def _modifier_parts(node: Node, source: Optional[bytes | str] = None) -> List[str]:
+    """Returns the non-comment modifier tokens of a declaration node, read from its first child only."""
+    # the grammar always places optional modifiers first, so no scan over node.children is needed
+    modifiers_node = node.child(0)
+    if modifiers_node is None or modifiers_node.kind_id != JavaNodeKind.MODIFIERS:
+        return []
+    parts = []
+    for mod_child in modifiers_node.children:
+        mod_kind = mod_child.kind_id
+        keyword = JavaNodeKind.MODIFIER_KEYWORDS.get(mod_kind)
+        if keyword is not None:
+            parts.append(keyword)
+        elif mod_kind not in JavaNodeKind.COMMENTS:
+            # annotations are the only modifiers whose text varies
+            parts.append(_node_text(mod_child, source).strip())
+    return parts
+
+def _point_at(source: bytes, byte: int) -> tuple[int, int]:
+    """(row, column) of a byte offset, both counted in bytes as tree-sitter expects."""
+    row = source.count(b"\n", 0, byte)
+    return row, byte - (source.rfind(b"\n", 0, byte) + 1)
+
+def _source_edit(old: bytes, new: bytes) -> Dict[str, Any]:
+    """Describes old -> new as one tree-sitter edit spanning everything between their common prefix and suffix."""
+    limit = min(len(old), len(new))
+    # binary search on slice equality keeps the byte comparisons in C
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]: lo = mid
+        else: hi = mid - 1
+    start = lo
+    lo, hi = 0, limit - start
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]: lo = mid
+        else: hi = mid - 1
+    old_end, new_end = len(old) - lo, len(new) - lo
+    return dict(
+        start_byte=start, old_end_byte=old_end, new_end_byte=new_end,
+        start_point=_point_at(old, start), old_end_point=_point_at(old, old_end), new_end_point=_point_at(new, new_end),
+    )
+
 class JavaBuilder(BaseBuilder):
     
     def build_file(self) -> "JavaFileBuilder": 
@@ -21,49 +85,97 @@ class JavaBuilder(BaseBuilder):
     
     
 class JavaFileBuilder(BaseFileBuilder):
-    def from_path(self, path: Path, parent: BaseStruct=None) -> BaseFile:
+    # parsed trees keyed by sha256 of the source, bounded for long-running watch/mcp sessions
+    _tree_cache: OrderedDict[str, Tree] = OrderedDict()
+    # last (source, tree) seen per resolved path, so an edited file is reparsed incrementally from its previous tree
+    _path_trees: OrderedDict[str, tuple[bytes, Tree]] = OrderedDict()
+    _TREE_CACHE_SIZE: int = 256
+    _tree_cache_lock = threading.Lock()
+    
+    @classmethod
+    def parse_source(cls, source: bytes, path: Optional[Path] = None) -> Tree:
+        """Parses java source bytes, reusing the cached tree when the exact content was parsed before
+        and reparsing incrementally from the path's previous tree when only part of the file changed."""
+        content_hash = hashlib.sha256(source).hexdigest()
+        path_key = str(Path(path).resolve()) if path is not None else None
+        with cls._tree_cache_lock:
+            tree = cls._tree_cache.get(content_hash)
+            if tree is not None:
+                cls._tree_cache.move_to_end(content_hash)
+            previous = cls._path_trees.get(path_key) if path_key else None
+        
+        if tree is None:
+            if previous is not None:
+                old_source, old_tree = previous
+                # cached trees are shared with structs already built from them, so only a copy is edited
+                edited_tree = old_tree.copy()
+                edited_tree.edit(**_source_edit(old_source, source))
+                tree = _parser().parse(source, edited_tree)
+                # error recovery can differ from a fresh parse, so broken files are parsed from scratch
+                if tree.root_node.has_error:
+                    tree = _parser().parse(source)
+            else:
+                tree = _parser().parse(source)
+        
+        with cls._tree_cache_lock:
+            cls._tree_cache[content_hash] = tree
+            if len(cls._tree_cache) > cls._TREE_CACHE_SIZE:
+                cls._tree_cache.popitem(last=False)
+            if path_key:
+                cls._path_trees[path_key] = (source, tree)
+                cls._path_trees.move_to_end(path_key)
+                if len(cls._path_trees) > cls._TREE_CACHE_SIZE:
+                    cls._path_trees.popitem(last=False)
+        return tree
+    
+    def prefetch(self, path: Path) -> bytes:
+        """Reads and parses the file into the tree cache so from_path finds it there."""
+        with open(path, "rb") as f:
+            source = f.read()
+        self.parse_source(source, path)
+        return source
+    
+    def from_path(self, path: Path, parent: BaseStruct=None, source: Optional[bytes] = None) -> BaseFile:
         file_obj = super().from_path(path)
     
         imports = []
-        body_bytes = b""
+        body_bytes = source
         
-        with open(path, "rb") as f:
-            body_bytes = f.read()
+        if body_bytes is None:
+            with open(path, "rb") as f:
+                body_bytes = f.read()
         file_obj.body = body_bytes.decode("utf-8")
+        # ascii files (nearly all java) slice the text decoded above instead of decoding every node again
+        node_source = file_obj.body if body_bytes.isascii() else body_bytes
         
-        parser = Parser(JAVA_LANGUAGE)
-        tree = parser.parse(body_bytes)
+        tree = self.parse_source(body_bytes, path)
         file_obj.node = tree.root_node
         
-        # parse tree-sitter tree for children and imports
-        class_builder = JavaClassBuilder(self.registry)
-        method_builder = JavaMethodBuilder(self.registry)
-        field_builder = JavaFieldBuilder(self.registry)
-        enum_builder = JavaEnumBuilder(self.registry)
-        for child in file_obj.node.children:
-            if child.type == "package_declaration":
+        # parse tree-sitter tree for children and imports in a single cursor pass
+        class_builder = JavaClassBuilder(self.registry, DependencyIndex(file_obj.node), node_source)
+        cursor = file_obj.node.walk()
+        has_child = cursor.goto_first_child()
+        while has_child:
+            child = cursor.node
+            child_kind = child.kind_id
+            if child_kind == JavaNodeKind.PACKAGE_DECLARATION:
                 for grandchild in child.children:
-                    if grandchild.type in {"scoped_identifier", "identifier"}:
-                        file_obj.package = grandchild.text.decode('utf-8')
+                    if grandchild.kind_id in JavaNodeKind.IDENTIFIERS:
+                        file_obj.package = _node_text(grandchild, node_source)
                         break
-                    
-            if child.type == "import_declaration":
+            elif child_kind == JavaNodeKind.IMPORT_DECLARATION:
+                imported = ""
                 for grandchild in child.children:
-                    if grandchild.type in {"scoped_identifier", "identifier"}:
-                        imports.append(grandchild.text.decode('utf-8'))
-                        
-            child_instance = None
-            if child.type == "class_declaration" or child.type == "interface_declaration":
-                child_instance = class_builder.from_node(child, parent=file_obj)
-            elif child.type == "enum_declaration":
-                child_instance = enum_builder.from_node(child, parent=file_obj)
-            elif child.type == "method_declaration":
-                child_instance = method_builder.from_node(child, parent=file_obj)
-            elif child.type == "field_declaration":
-                child_instance = field_builder.from_node(child, parent=file_obj)
-            if child_instance:
-                file_obj.add_child(child_instance)
-                self.registry.add_struct(child_instance)
+                    if grandchild.kind_id in JavaNodeKind.IDENTIFIERS:
+                        imported = _node_text(grandchild, node_source)
+                    elif grandchild.kind_id == JavaNodeKind.ASTERISK:
+                        # wildcard imports keep their ".*" so they can be told apart from a class import
+                        imported += ".*"
+                if imported:
+                    imports.append(intern(imported))
+            else:
+                class_builder.build_member(child, parent=file_obj)
+            has_child = cursor.goto_next_sibling()
         
         file_obj.imports = imports
         
@@ -71,43 +183,68 @@ class JavaFileBuilder(BaseFileBuilder):
         
         
 class JavaClassBuilder(BaseClassBuilder):
+    def __init__(self, registry: Registry, dependency_index: Optional[DependencyIndex] = None, source: Optional[bytes | str] = None):
+        super().__init__(registry)
+        self.dependency_index = dependency_index
+        self.source = source
+        self._member_builders: Dict[int, BaseCodeStructBuilder] = None
+    
+    @property
+    def member_builders(self) -> Dict[int, BaseCodeStructBuilder]:
+        """Dispatch table from member node kind id to the builder that handles it, built once per builder."""
+        if self._member_builders is None:
+            method_builder = JavaMethodBuilder(self.registry, self.dependency_index, self.source)
+            self._member_builders = {
+                JavaNodeKind.CLASS_DECLARATION: self,
+                JavaNodeKind.INTERFACE_DECLARATION: self,
+                JavaNodeKind.ENUM_DECLARATION: JavaEnumBuilder(self.registry, self.dependency_index, self.source),
+                JavaNodeKind.CONSTRUCTOR_DECLARATION: method_builder,
+                JavaNodeKind.METHOD_DECLARATION: method_builder,
+                JavaNodeKind.FIELD_DECLARATION: JavaFieldBuilder(self.registry, self.source),
+            }
+        return self._member_builders
+    
+    def build_member(self, node: Node, parent: BaseStruct) -> Optional[BaseStruct]:
+        """Builds the struct for a class/file member node, attaching it to the parent and registry. Returns None for non-member nodes."""
+        member_builder = self.member_builders.get(node.kind_id)
+        if member_builder is None:
+            return None
+        child_instance = member_builder.from_node(node, parent=parent)
+        if child_instance:
+            parent.add_child(child_instance)
+            self.registry.add_struct(child_instance)
+        return child_instance
+    
     def from_node(self, node: Node, parent: BaseStruct=None) -> BaseClass:
-        body = node.text.decode('utf-8')
-        sig_parts = []
         name = ""
         
         # MODIFIERS
-        for child in node.children:
-            if child.type == 'modifiers':
-                for mod_child in child.children:
-                    if 'comment' not in mod_child.type:
-                        sig_parts.append(mod_child.text.decode('utf-8').strip())
-                break
+        sig_parts = _modifier_parts(node, self.source)
         
         sig_parts.append("class")
         
         # NAME
-        name_node = node.child_by_field_name('name')
+        name_node = node.child_by_field_id(JavaFieldId.NAME)
         if name_node:
-            name = name_node.text.decode('utf-8').strip()
+            name = intern(_node_text(name_node, self.source).strip())
             
         # TYPE PARAMETERS
-        type_params_node = node.child_by_field_name('type_parameters')
+        type_params_node = node.child_by_field_id(JavaFieldId.TYPE_PARAMETERS)
         type_params_string = ""
         if type_params_node:
-            type_params_string = type_params_node.text.decode('utf-8').strip()
+            type_params_string = _node_text(type_params_node, self.source).strip()
         
         # INHERITS
         inherit_strings = []
-        inherits_node = node.child_by_field_name('superclass')
+        inherits_node = node.child_by_field_id(JavaFieldId.SUPERCLASS)
         if inherits_node:
             identifier_node = inherits_node.named_children[0]
-            inherit_strings.append(identifier_node.text.decode('utf-8').strip())
-        interfaces_node = node.child_by_field_name('interfaces')
+            inherit_strings.append(intern(_node_text(identifier_node, self.source).strip()))
+        interfaces_node = node.child_by_field_id(JavaFieldId.INTERFACES)
         if interfaces_node:
             type_list_node = interfaces_node.named_children[0]
             for type_node in type_list_node.named_children:
-                inherit_strings.append(type_node.text.decode('utf-8').strip())
+                inherit_strings.append(intern(_node_text(type_node, self.source).strip()))
         
         # SIGNATURE
         sig_prefix = " ".join(sig_parts).replace('\n', ' ')
@@ -129,7 +266,6 @@ class JavaClassBuilder(BaseClassBuilder):
             
             # BaseCodeStruct
             signature=signature,
-            body=body,
             start_line=node.start_point[0],
             end_line=node.end_point[0],
             node=node,
@@ -139,70 +275,54 @@ class JavaClassBuilder(BaseClassBuilder):
         )
         
         # PARSE FOR CHILDREN
-        class_builder = JavaClassBuilder(self.registry)
-        method_builder = JavaMethodBuilder(self.registry)
-        field_builder = JavaFieldBuilder(self.registry)
-        enum_builder = JavaEnumBuilder(self.registry)
-        
-        body_node = node.child_by_field_name('body')
+        body_node = node.child_by_field_id(JavaFieldId.BODY)
         if body_node:
-            for child in body_node.children:
-                child_instance = None
-                if child.type == "class_declaration" or child.type == "interface_declaration":
-                    child_instance = class_builder.from_node(child, parent=instance)
-                elif child.type == "enum_declaration":
-                    child_instance = enum_builder.from_node(child, parent=instance)
-                elif child.type == "constructor_declaration":
-                    child_instance = method_builder.from_node(child, parent=instance)
-                elif child.type == "method_declaration":
-                    child_instance = method_builder.from_node(child, parent=instance)
-                elif child.type == "field_declaration":
-                    child_instance = field_builder.from_node(child, parent=instance)
-                if child_instance:
-                    instance.add_child(child_instance)
-                    self.registry.add_struct(child_instance)
+            cursor = body_node.walk()
+            has_child = cursor.goto_first_child()
+            while has_child:
+                self.build_member(cursor.node, parent=instance)
+                has_child = cursor.goto_next_sibling()
             
         return instance
         
         
 
 class JavaMethodBuilder(BaseMethodBuilder):
+    def __init__(self, registry: Registry, dependency_index: Optional[DependencyIndex] = None, source: Optional[bytes | str] = None):
+        super().__init__(registry)
+        self.dependency_index = dependency_index
+        self.source = source
+    
     def from_node(self, node: Node, parent: BaseStruct=None) -> BaseMethod:
-        body = node.text.decode('utf-8')
-        sig_parts = []
         name = ""
         
         # MODIFIERS
-        for child in node.children:
-            if child.type == 'modifiers':
-                for mod_child in child.children:
-                    if 'comment' not in mod_child.type:
-                        sig_parts.append(mod_child.text.decode('utf-8').strip())
+        sig_parts = _modifier_parts(node, self.source)
         
         # TYPE PARAMETERS
-        type_params_node = node.child_by_field_name('type_parameters')
+        type_params_node = node.child_by_field_id(JavaFieldId.TYPE_PARAMETERS)
         if type_params_node:
-            sig_parts.append(type_params_node.text.decode('utf-8').strip())
+            sig_parts.append(_node_text(type_params_node, self.source).strip())
         
         # TYPE
-        type_node = node.child_by_field_name('type')
+        type_node = node.child_by_field_id(JavaFieldId.TYPE)
         if type_node:
-            sig_parts.append(type_node.text.decode('utf-8').strip())
+            sig_parts.append(_node_text(type_node, self.source).strip())
         
         # NAME
-        name_node = node.child_by_field_name('name')
+        name_node = node.child_by_field_id(JavaFieldId.NAME)
         if name_node:
-            name = name_node.text.decode('utf-8').strip()
+            name = intern(_node_text(name_node, self.source).strip())
         
         # PARAMETERS
         parameters = []
-        params_node = node.child_by_field_name('parameters')
+        params_node = node.child_by_field_id(JavaFieldId.PARAMETERS)
         if params_node:
             for param_child in params_node.named_children:
-                if param_child.type == 'formal_parameter':
-                    param_type_node = param_child.child_by_field_name('type')
+                if param_child.kind_id == JavaNodeKind.FORMAL_PARAMETER:
+                    param_type_node = param_child.child_by_field_id(JavaFieldId.TYPE)
                     if param_type_node:
-                        parameters.append(param_type_node.text.decode('utf-8').strip())
+                        parameters.append(_node_text(param_type_node, self.source).strip())
             
         arity = len(parameters)
         parameters_string = f"({', '.join(parameters)})"
@@ -217,16 +337,15 @@ class JavaMethodBuilder(BaseMethodBuilder):
         else:
             uid = f"{parent.uid}.{name}{parameters_string}"
         
-        dependency_names = []
+        # repeated calls to the same (name, arity) resolve identically, so each target is kept once, in first-call order
+        dependency_names = {}
         
-        query = Query(JAVA_LANGUAGE, DEPENDENCY_QUERY)
-        cursor = QueryCursor(query)
-        captures = cursor.captures(node)
-        for dep in captures.get("dependencies", []):
-            name = dep.child_by_field_name('name').text.decode('utf-8').strip()
-            parameters = dep.child_by_field_name('arguments')
-            arity = len(parameters.named_children)
-            dependency_names.append((name, arity))
+        # standalone calls (no file pass) index just this method
+        dependency_index = self.dependency_index or DependencyIndex(node)
+        for dep in dependency_index.within(node):
+            dep_name = intern(_node_text(dep.child_by_field_id(JavaFieldId.NAME), self.source).strip())
+            dep_arguments = dep.child_by_field_id(JavaFieldId.ARGUMENTS)
+            dependency_names[(dep_name, len(dep_arguments.named_children))] = None
         
         return BaseMethod(
             # BaseStruct
@@ -238,41 +357,38 @@ class JavaMethodBuilder(BaseMethodBuilder):
             
             # BaseCodeStruct
             signature=signature,
-            body=body,
             start_line=node.start_point[0],
             end_line=node.end_point[0],
             node=node,
             
             # BaseMethod
             arity=arity,
-            dependency_names=dependency_names,
+            dependency_names=list(dependency_names),
         )
 
 class JavaFieldBuilder(BaseFieldBuilder):
+    def __init__(self, registry: Registry, source: Optional[bytes | str] = None):
+        super().__init__(registry)
+        self.source = source
+    
     def from_node(self, node: Node, parent: BaseStruct=None) -> BaseField:
-        body = node.text.decode('utf-8')
-        sig_parts = []
         name = ""
         
         # MODIFIERS
-        for child in node.children:
-            if child.type == 'modifiers':
-                for mod_child in child.children:
-                    if 'comment' not in mod_child.type:
-                        sig_parts.append(mod_child.text.decode('utf-8').strip())
+        sig_parts = _modifier_parts(node, self.source)
         
         # TYPE
-        type_node = node.child_by_field_name('type')
-        field_type = type_node.text.decode('utf-8').strip() if type_node else ""
+        type_node = node.child_by_field_id(JavaFieldId.TYPE)
+        field_type = intern(_node_text(type_node, self.source).strip()) if type_node else ""
         if field_type:
             sig_parts.append(field_type)
         
         # NAME
-        declarator_node = node.child_by_field_name('declarator')
+        declarator_node = node.child_by_field_id(JavaFieldId.DECLARATOR)
         if declarator_node:
-            name_node = declarator_node.child_by_field_name('name')
+            name_node = declarator_node.child_by_field_id(JavaFieldId.NAME)
             if name_node:
-                name = name_node.text.decode('utf-8').strip()
+                name = intern(_node_text(name_node, self.source).strip())
                 sig_parts.append(name)
         
         signature = " ".join(sig_parts).replace('\n', ' ')
@@ -293,7 +409,6 @@ class JavaFieldBuilder(BaseFieldBuilder):
             
             # BaseCodeStruct
             signature=signature,
-            body=body,
             start_line=node.start_point[0],
             end_line=node.end_point[0],
             node=node,
@@ -1,4 +1,46 @@
 import tree_sitter_java as tsjava
 from tree_sitter import Language
 
-JAVA_LANGUAGE = Language(tsjava.language())
\ No newline at end of file
+JAVA_LANGUAGE = Language(tsjava.language())
+
+class JavaNodeKind:
+    """Integer node kind ids for the java grammar, resolved once so hot loops compare ints instead of node.type strings."""
+    PACKAGE_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("package_declaration", True)
+    IMPORT_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("import_declaration", True)
+    CLASS_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("class_declaration", True)
+    INTERFACE_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("interface_declaration", True)
+    ENUM_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("enum_declaration", True)
+    CONSTRUCTOR_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("constructor_declaration", True)
+    METHOD_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("method_declaration", True)
+    FIELD_DECLARATION: int = JAVA_LANGUAGE.id_for_node_kind("field_declaration", True)
+    MODIFIERS: int = JAVA_LANGUAGE.id_for_node_kind("modifiers", True)
+    FORMAL_PARAMETER: int = JAVA_LANGUAGE.id_for_node_kind("formal_parameter", True)
+    IDENTIFIER: int = JAVA_LANGUAGE.id_for_node_kind("identifier", True)
+    SCOPED_IDENTIFIER: int = JAVA_LANGUAGE.id_for_node_kind("scoped_identifier", True)
+    ASTERISK: int = JAVA_LANGUAGE.id_for_node_kind("asterisk", True)
+    LINE_COMMENT: int = JAVA_LANGUAGE.id_for_node_kind("line_comment", True)
+    BLOCK_COMMENT: int = JAVA_LANGUAGE.id_for_node_kind("block_comment", True)
+    
+    IDENTIFIERS: frozenset[int] = frozenset({IDENTIFIER, SCOPED_IDENTIFIER})
+    COMMENTS: frozenset[int] = frozenset({LINE_COMMENT, BLOCK_COMMENT})
+    
+    # anonymous keyword tokens always spell their own kind, so modifier text can be looked up instead of decoded
+    MODIFIER_KEYWORDS: dict[int, str] = {
+        JAVA_LANGUAGE.id_for_node_kind(keyword, False): keyword
+        for keyword in (
+            "public", "protected", "private", "abstract", "static", "final", "strictfp", "default",
+            "synchronized", "native", "transient", "volatile", "sealed", "non-sealed",
+        )
+    }
+
+class JavaFieldId:
+    """Integer grammar field ids, resolved once so builders use child_by_field_id instead of string lookups."""
+    NAME: int = JAVA_LANGUAGE.field_id_for_name("name")
+    TYPE: int = JAVA_LANGUAGE.field_id_for_name("type")
+    TYPE_PARAMETERS: int = JAVA_LANGUAGE.field_id_for_name("type_parameters")
+    SUPERCLASS: int = JAVA_LANGUAGE.field_id_for_name("superclass")
+    INTERFACES: int = JAVA_LANGUAGE.field_id_for_name("interfaces")
+    PARAMETERS: int = JAVA_LANGUAGE.field_id_for_name("parameters")
+    BODY: int = JAVA_LANGUAGE.field_id_for_name("body")
+    DECLARATOR: int = JAVA_LANGUAGE.field_id_for_name("declarator")
+    ARGUMENTS: int = JAVA_LANGUAGE.field_id_for_name("arguments")
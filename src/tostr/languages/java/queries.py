@@ -1,5 +1,38 @@
+import threading
+from bisect import bisect_left
+from typing import List
+
+from tree_sitter import Node, Query, QueryCursor
+
+from tostr.languages.java.language import JAVA_LANGUAGE
+
 DEPENDENCY_QUERY = """
     (
         (method_invocation) @dependencies
     )
-"""
\ No newline at end of file
+"""
+
+# compiled once at import, query compilation is pure w.r.t. (language, source)
+DEPENDENCY_Q = Query(JAVA_LANGUAGE, DEPENDENCY_QUERY)
+
+_local = threading.local()
+
+def dependency_cursor() -> QueryCursor:
+    """Returns this thread's reusable cursor over DEPENDENCY_Q; captures() restarts it for each node."""
+    cursor = getattr(_local, "dependency_cursor", None)
+    if cursor is None:
+        cursor = _local.dependency_cursor = QueryCursor(DEPENDENCY_Q)
+    return cursor
+
+class DependencyIndex:
+    """All method invocations of a file from one query pass, sliced per method by byte range."""
+    def __init__(self, root: Node):
+        captures = dependency_cursor().captures(root)
+        self.nodes: List[Node] = sorted(captures.get("dependencies", []), key=lambda dep: dep.start_byte)
+        self.start_bytes: List[int] = [dep.start_byte for dep in self.nodes]
+    
+    def within(self, node: Node) -> List[Node]:
+        """Returns the invocations contained in node, in source order."""
+        lo = bisect_left(self.start_bytes, node.start_byte)
+        hi = bisect_left(self.start_bytes, node.end_byte, lo)
+        return self.nodes[lo:hi]
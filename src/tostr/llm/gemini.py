@@ -5,6 +5,11 @@ from google.genai import types
 from pydantic import BaseModel, Field
 from loguru import logger
 import time
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from tostr.core.models import BaseClass
 
 class MethodDescription(BaseModel):
     method_id: int = Field(description="The integer ID of the method provided in the prompt data")
@@ -17,21 +22,7 @@ class DescriptionResult(BaseModel):
     # needs_context: int = Field(description="Dependency on external/unknown state (0=Pure, 100=Dependent on external logic)")
     methods: list[MethodDescription] = Field(description="List of method information")
 
-class GeminiClient:
-    def __init__(self, api_key: str, model_name: str = "gemini-2.5-flash-lite"):
-        self.client = genai.Client(api_key=api_key)
-        self.model_name = model_name
-        self._semaphore = None
-    
-    @property
-    def semaphore(self):
-        # 2. Create it exactly once, the first time it is requested
-        if self._semaphore is None:
-            self._semaphore = asyncio.Semaphore(200)
-        return self._semaphore
-    
-    async def generate_description(self, class_obj: "BaseClass", imports: list[str]) -> dict:
-        system_instruction = """
+_SYSTEM_INSTRUCTION = """
 You are an expert senior software engineer and technical writer. 
 Your goal is to generate high-quality, information-dense documentation for software methods to be consumed by an AI Agent.
 The descriptions should be written in context; docs dont need to say 'this is a java class' or this is a method'.
@@ -46,17 +37,36 @@ Analyze the provided code and generate a JSON response.
    - **Style**: Technical, precise, and dense. Start with an active verb (e.g., "Calculates...", "Updates..."). Unless complexity is high, try to keep it to one sentence.
 Reference methods by their provided integer `method_id`.
 """
-        
-        # Create a mapping of method IDs to method objects
-        method_lookup = {idx: m for idx, m in enumerate(class_obj.methods)}
-        
-        
-        input_data = {
-            "code": class_obj.skeletonize(),
-            "method_ids_to_signatures": {idx: m.signature for idx, m in method_lookup.items()}
-        }
-        
-        logger.debug(f"Generating Description for {class_obj.uid}...")
+
+_BATCH_INSTRUCTION = _SYSTEM_INSTRUCTION + """
+### BATCH
+The input is a list of classes, each with its own `uid`, `code` and `method_ids_to_signatures`.
+Return one entry in `classes` per input class, keyed by that class's `uid`. Method ids are unique across the whole batch.
+"""
+
+class BatchDescriptionResult(BaseModel):
+    classes: list[DescriptionResult] = Field(description="One result per class provided in the prompt data")
+
+# response schemas are built once here rather than walked out of the models on every request
+_DESCRIPTION_SCHEMA = DescriptionResult.model_json_schema()
+_BATCH_SCHEMA = BatchDescriptionResult.model_json_schema()
+
+class GeminiClient:
+    def __init__(self, api_key: str, model_name: str = "gemini-2.5-flash-lite"):
+        self.client = genai.Client(api_key=api_key)
+        self.model_name = model_name
+        self._semaphore = None
+    
+    @property
+    def semaphore(self):
+        # 2. Create it exactly once, the first time it is requested
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(200)
+        return self._semaphore
+    
+    async def _generate_json(self, input_data: dict, system_instruction: str, schema: dict, label: str) -> dict:
+        """Sends one structured-output request, retrying on 503/429. Raises the last error once retries run out."""
+        logger.debug("Generating Description for {}...", label)
         start_time = time.perf_counter()
         
         max_retries = 3
@@ -71,37 +81,96 @@ Reference methods by their provided integer `method_id`.
                         config=types.GenerateContentConfig(
                             system_instruction=system_instruction,
                             response_mime_type="application/json",
-                            response_json_schema=DescriptionResult.model_json_schema(),
+                            response_json_schema=schema,
                             temperature=0.2,
                             max_output_tokens=8192
                         )
                     )
                     end_time = time.perf_counter()
                     elapsed_time = end_time - start_time
-                    logger.debug(f"✅ Generated Description for {class_obj.uid} in {elapsed_time:.4f} seconds.")
+                    logger.debug("✅ Generated Description for {} in {:.4f} seconds.", label, elapsed_time)
                     
-                    parsed_data = response.parsed
-                    
-                    # Re-map the returned integers back to their actual string UMIDs
-                    for method_result in parsed_data.get("methods", []):
-                        m_id = method_result.get("method_id")
-                        if m_id in method_lookup:
-                            method_result["uid"] = method_lookup[m_id].uid
-                            
-                    # logger.debug(f"Response: {parsed_data}")
-                    return parsed_data
+                    # logger.debug(f"Response: {response.parsed}")
+                    return response.parsed
                     
                 except Exception as e:
                     error_str = str(e)
                     if "503" in error_str or "429" in error_str:
                         if attempt < max_retries - 1:
-                            sleep_time = base_delay * (2 ** attempt)
-                            logger.warning(f"⏳ Server busy (503/429) on {class_obj.uid}. Retrying in {sleep_time}s...")
+                            # jittered so requests throttled together do not all retry in the same instant
+                            sleep_time = base_delay * (2 ** attempt) * random.uniform(0.5, 1.5)
+                            logger.warning(f"⏳ Server busy (503/429) on {label}. Retrying in {sleep_time:.1f}s...")
                             await asyncio.sleep(sleep_time)
                             continue 
-                            
-                    return {
-                        "uid": class_obj.uid,
-                        "error": error_str,
-                        "status": "error"
-                    }
\ No newline at end of file
+                    raise
+    
+    async def generate_description(self, class_obj: "BaseClass", imports: list[str]) -> dict:
+        
+        # Create a mapping of method IDs to method objects
+        method_lookup = {idx: m for idx, m in enumerate(class_obj.methods)}
+        
+        try:
+            input_data = {
+                "code": class_obj.skeletonize(),
+                "method_ids_to_signatures": {idx: m.signature for idx, m in method_lookup.items()}
+            }
+            
+            parsed_data = await self._generate_json(input_data, _SYSTEM_INSTRUCTION, _DESCRIPTION_SCHEMA, class_obj.uid)
+            
+            # Re-map the returned integers back to their actual string UMIDs
+            for method_result in parsed_data.get("methods", []):
+                m_id = method_result.get("method_id")
+                if m_id in method_lookup:
+                    method_result["uid"] = method_lookup[m_id].uid
+        except Exception as e:
+            return {
+                "uid": class_obj.uid,
+                "error": str(e),
+                "status": "error"
+            }
+        
+        return parsed_data
+    
+    async def generate_descriptions_batch(self, class_objs: list["BaseClass"]) -> list[dict]:
+        """Describes several classes in one request. Returns one response per class, in the order given,
+        with an error response for any class whose code could not be rendered, and None for any class the
+        model left out of its answer or that was in a request that failed as a whole."""
+        # method ids run across the whole batch so each one maps back to exactly one method
+        method_lookup = {}
+        classes_data = []
+        payload_errors = {}
+        for class_obj in class_objs:
+            try:
+                code = class_obj.skeletonize()
+            except Exception as e:
+                # one class that cannot be rendered fails on its own instead of sinking the batch
+                payload_errors[class_obj.uid] = {"uid": class_obj.uid, "error": str(e), "status": "error"}
+                continue
+            method_ids = {}
+            for m in class_obj.methods:
+                method_ids[len(method_lookup)] = m.signature
+                method_lookup[len(method_lookup)] = m
+            classes_data.append({
+                "uid": class_obj.uid,
+                "code": code,
+                "method_ids_to_signatures": method_ids,
+            })
+        
+        results_by_uid = {}
+        if classes_data:
+            label = f"batch of {len(classes_data)} classes"
+            try:
+                parsed_data = await self._generate_json({"classes": classes_data}, _BATCH_INSTRUCTION, _BATCH_SCHEMA, label)
+                
+                for class_result in parsed_data.get("classes", []):
+                    # Re-map the returned integers back to their actual string UMIDs
+                    for method_result in class_result.get("methods", []):
+                        m_id = method_result.get("method_id")
+                        if m_id in method_lookup:
+                            method_result["uid"] = method_lookup[m_id].uid
+                    results_by_uid[class_result.get("uid")] = class_result
+            except Exception as e:
+                # left as None so the caller can describe each class on its own
+                logger.warning(f"⚠️ Request for {label} failed: {e}")
+        
+        return [payload_errors.get(c.uid) or results_by_uid.get(c.uid) for c in class_objs]
@@ -0,0 +1,8 @@
+import pytest
+
+@pytest.fixture
+def java_project(tmp_path, monkeypatch):
+    """A one-file project on disk, with the working directory set to its root as the CLI does."""
+    (tmp_path / "B.java").write_text("class B { int size() { return items.length; } }\n")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
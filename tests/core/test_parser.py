@@ -0,0 +1,143 @@
+import asyncio
+import pytest
+from pathlib import Path
+
+from tostr.core.db import SQLiteCache
+from tostr.core.models import Directory
+from tostr.core.parser import BaseParser
+from tostr.core.registry import Registry
+
+class StubLLM:
+    """Answers description requests locally, recording how classes were grouped into requests."""
+    def __init__(self, drop_from_batch=(), fail_batches=False):
+        self.batches = []
+        self.singles = []
+        self.payloads = {}
+        self.drop_from_batch = set(drop_from_batch)
+        self.fail_batches = fail_batches
+    
+    def describe(self, class_obj):
+        self.payloads[class_obj.uid] = class_obj.skeletonize()
+        return {"uid": class_obj.uid, "description": f"d:{class_obj.name}", "methods": [{"uid": m.uid, "description": f"m:{m.name}"} for m in class_obj.methods]}
+    
+    async def generate_description(self, class_obj, imports):
+        self.singles.append(class_obj.uid)
+        return self.describe(class_obj)
+    
+    async def generate_descriptions_batch(self, class_objs):
+        self.batches.append([c.uid for c in class_objs])
+        if self.fail_batches:
+            raise RuntimeError("batch request failed")
+        return [None if c.name in self.drop_from_batch else self.describe(c) for c in class_objs]
+
+@pytest.fixture
+def class_project(tmp_path, monkeypatch):
+    small = "".join(f"class S{i} {{ void run{i}() {{}} }}\n" for i in range(4))
+    (tmp_path / "Small.java").write_text(small)
+    big_body = "".join(f"    int v{i} = {i};\n" for i in range(40))
+    (tmp_path / "Big.java").write_text(f"class Big {{\n{big_body}    void big() {{}}\n}}\n")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def describe_project(project, llm, batch_size=2, batch_bytes=200):
+    registry = Registry(use_cache=False, project_path=project)
+    parser = BaseParser(project, llm, registry)
+    parser._DESCRIPTION_BATCH_SIZE = batch_size
+    parser._DESCRIPTION_BATCH_BYTES = batch_bytes
+    parser.parse_path(Path("."))
+    asyncio.run(parser.resolve_descriptions_async())
+    return registry
+
+# each small class is 28 bytes: the first case is capped by class count, the second by the byte budget
+@pytest.mark.parametrize("batch_size, batch_bytes", [(2, 200), (8, 60)], ids=["size-limited", "byte-limited"])
+def test_parser_packs_classes_into_bounded_batches(class_project, batch_size, batch_bytes):
+    llm = StubLLM()
+    registry = describe_project(class_project, llm, batch_size, batch_bytes)
+    
+    assert [len(batch) for batch in llm.batches] == [2, 2]
+    for batch in llm.batches:
+        assert sum(len(registry.uid_map[uid].body) for uid in batch) <= batch_bytes
+    small_uids = sorted(uid for batch in llm.batches for uid in batch)
+    assert small_uids == [f"Small.java#S{i}" for i in range(4)]
+    
+    # The oversized class goes out on its own
+    assert llm.singles == ["Big.java#Big"]
+    assert registry.uid_map["Big.java#Big.big()"].description == "m:big"
+    assert all(registry.uid_map[f"Small.java#S{i}.run{i}()"].description == f"m:run{i}" for i in range(4))
+
+def test_parser_never_batches_nested_class_with_its_outer_class(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "Outer.java").write_text("class Outer {\n    void o() {}\n    class Inner { void i() {} }\n}\nclass Other { void x() {} }\n")
+    llm = StubLLM()
+    registry = describe_project(tmp_path, llm, batch_size=8, batch_bytes=1000)
+    
+    requests = llm.batches + [[uid] for uid in llm.singles]
+    assert sorted(uid for request in requests for uid in request) == ["Outer.java#Other", "Outer.java#Outer", "Outer.java#Outer.Inner"]
+    assert not any({"Outer.java#Outer", "Outer.java#Outer.Inner"} <= set(request) for request in requests)
+    assert registry.uid_map["Outer.java#Outer.Inner"].description == "d:Inner"
+
+def test_parser_describes_classes_missing_from_batch_on_their_own(class_project):
+    llm = StubLLM(drop_from_batch={"S1"})
+    registry = describe_project(class_project, llm)
+    
+    assert "Small.java#S1" in llm.singles
+    assert registry.uid_map["Small.java#S1"].description == "d:S1"
+    assert registry.uid_map["Small.java#S1.run1()"].description == "m:run1"
+
+def test_parser_describes_failed_batch_one_class_at_a_time(class_project):
+    llm = StubLLM(fail_batches=True)
+    registry = describe_project(class_project, llm)
+    
+    assert len(llm.batches) == 2
+    assert sorted(llm.singles) == ["Big.java#Big"] + [f"Small.java#S{i}" for i in range(4)]
+    assert all(registry.uid_map[f"Small.java#S{i}"].description == f"d:S{i}" for i in range(4))
+
+def test_parser_build_files_keeps_walk_order_and_skips_unsupported(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    names = ["Zeta.java", "notes.txt", "Alpha.java", "Mid.java", "README.md", "Beta.java"]
+    for name in names:
+        (tmp_path / name).write_text(f"class {Path(name).stem} {{}}\n" if name.endswith(".java") else "text\n")
+    registry = Registry(use_cache=False, project_path=tmp_path)
+    parser = BaseParser(tmp_path, None, registry)
+    # a window smaller than the file list exercises refilling the prefetch queue
+    parser._PREFETCH_WINDOW = 2
+    root = Directory(path=Path("."), registry=registry)
+    registry.add_struct(root)
+    
+    parser.build_files([(Path(name), root) for name in names])
+    
+    java_names = [name for name in names if name.endswith(".java")]
+    assert [f.uid for f in registry.files] == java_names
+    assert sorted(f.uid for f in root.files) == sorted(java_names)
+
+def test_parser_describes_partially_restored_class(java_project):
+    source = java_project / "A.java"
+    source.write_text("class A {\n    void a() { x(); }\n    void b() { y(); }\n}\n")
+    def describe_cached(llm):
+        registry = Registry(db=SQLiteCache(java_project / ".tostr" / "cache.db"), use_cache=True, project_path=java_project)
+        parser = BaseParser(java_project, llm, registry)
+        parser.parse_path(Path("."))
+        asyncio.run(parser.resolve_descriptions_async())
+        registry.save_to_cache()
+        return registry
+    describe_cached(StubLLM())
+    
+    # Only b() changes, so a() comes back from the cache and is skeletonized in the class payload
+    source.write_text("class A {\n    void a() { x(); }\n    void b() { z(); }\n}\n")
+    llm = StubLLM()
+    registry = describe_cached(llm)
+    
+    payload = llm.payloads["A.java#A"]
+    assert "// m:a" in payload and "x();" not in payload
+    assert "z();" in payload
+    assert registry.uid_map["A.java#A"].description == "d:A"
+    assert registry.uid_map["A.java#A.b()"].description == "m:b"
+
+def test_parser_skips_single_unsupported_file(java_project):
+    (java_project / "notes.txt").write_text("text\n")
+    registry = Registry(use_cache=False, project_path=java_project)
+    
+    BaseParser(java_project, None, registry).parse_path(Path("notes.txt"))
+    
+    assert registry.root is None
+    assert not registry.uid_map
@@ -0,0 +1,97 @@
+from pathlib import Path
+
+from tostr.core.db import SQLiteCache
+from tostr.core.parser import BaseParser
+from tostr.core.registry import Registry
+
+def parse_project(project, use_cache=True):
+    registry = Registry(use_cache=use_cache, db=SQLiteCache(project / ".tostr" / "cache.db"), project_path=project)
+    BaseParser(project, None, registry).parse_path(Path("."))
+    return registry
+
+def test_registry_restores_cached_descriptions_for_unchanged_structs(java_project):
+    (java_project / "D.java").write_text("class D { void draw() {} }\n")
+    registry = parse_project(java_project)
+    registry.uid_map["B.java#B.size()"].description = "Counts the items."
+    registry.uid_map["D.java#D.draw()"].description = "Draws the shape."
+    registry.save_to_cache()
+    
+    # A formatting-only edit keeps the body hash, a real edit does not
+    (java_project / "B.java").write_text("class B {\n    int size() {\n        return items.length;\n    }\n}\n")
+    (java_project / "D.java").write_text("class D { void draw() { fill(); } }\n")
+    registry = parse_project(java_project)
+    
+    assert registry.uid_map["B.java#B.size()"].description == "Counts the items."
+    assert registry.uid_map["D.java#D.draw()"].description == ""
+
+def test_registry_ignores_stale_cached_descriptions(java_project):
+    registry = parse_project(java_project)
+    registry.uid_map["B.java#B.size()"].description = "Counts the items."
+    registry.save_to_cache(stale=True)
+    
+    registry = parse_project(java_project)
+    
+    assert registry.uid_map["B.java#B.size()"].description == ""
+
+def test_registry_restores_cached_description_for_duplicated_body(java_project):
+    registry = parse_project(java_project)
+    registry.uid_map["B.java#B.size()"].description = "Counts the items."
+    registry.save_to_cache()
+    
+    # Same method body under a new uid
+    (java_project / "C.java").write_text("class C { int size() { return items.length; } }\n")
+    registry = parse_project(java_project)
+    
+    assert registry.uid_map["B.java#B.size()"].description == "Counts the items."
+    assert registry.uid_map["C.java#C.size()"].description == "Counts the items."
+
+def test_registry_shares_descriptions_between_identical_bodies(java_project):
+    (java_project / "C.java").write_text("class C { int size() { return items.length; } }\n")
+    registry = parse_project(java_project, use_cache=False)
+    registry.uid_map["B.java#B.size()"].description = "Counts the items."
+    
+    registry.share_descriptions()
+    
+    assert registry.uid_map["C.java#C.size()"].description == "Counts the items."
+    assert registry.uid_map["C.java#C"].description == ""
+
+def test_registry_resolves_imports_by_package(java_project):
+    for package in ("a", "b"):
+        (java_project / package).mkdir()
+        (java_project / package / "Util.java").write_text(f"package {package};\nclass Util {{ static void help() {{}} }}\n")
+    (java_project / "c").mkdir()
+    (java_project / "c" / "Tool.java").write_text("package c;\nclass Tool { static void help() {} }\n")
+    (java_project / "Main.java").write_text("import b.Util;\nimport c.*;\nclass Main { void run() { help(); } }\n")
+    registry = parse_project(java_project, use_cache=False)
+    registry.root.resolve_dependencies()
+    
+    run = registry.uid_map["Main.java#Main.run()"]
+    # a.Util shares the simple name of the imported class but lives in another package
+    assert sorted(dep.uid for dep in run.outbound_dependencies) == ["b/Util.java#Util.help()", "c/Tool.java#Tool.help()"]
+
+def test_registry_stale_save_keeps_restored_descriptions(java_project):
+    (java_project / "D.java").write_text("class D { void draw() {} }\n")
+    registry = parse_project(java_project)
+    registry.uid_map["B.java#B.size()"].description = "Counts the items."
+    registry.save_to_cache()
+    
+    registry = parse_project(java_project)
+    registry.uid_map["D.java#D.draw()"].description = "Draws the shape."
+    registry.save_to_cache(stale=True)
+    
+    # The restored description is still current; only the one not read back from the cache is marked
+    registry = parse_project(java_project)
+    assert registry.uid_map["B.java#B.size()"].description == "Counts the items."
+    assert registry.uid_map["D.java#D.draw()"].description == ""
+
+def test_registry_load_cache_hydrates_class_and_method_descriptions(java_project):
+    registry = parse_project(java_project)
+    registry.uid_map["B.java#B"].description = "A bag of items."
+    registry.uid_map["B.java#B.size()"].description = "Counts the items."
+    registry.save_to_cache()
+    
+    registry = Registry(db=SQLiteCache(java_project / ".tostr" / "cache.db"), project_path=java_project)
+    BaseParser(java_project, None, registry).load_cache()
+    
+    assert registry.uid_map["B.java#B"].description == "A bag of items."
+    assert registry.uid_map["B.java#B.size()"].description == "Counts the items."
@@ -1,9 +1,12 @@
 import pytest
 from pathlib import Path
 from unittest.mock import MagicMock
+from tree_sitter import Parser
 
 from tostr.core.registry import Registry
+from tostr.languages.java import builders as java_builders
 from tostr.languages.java.builders import JavaFileBuilder
+from tostr.languages.java.language import JAVA_LANGUAGE
 
 @pytest.fixture
 def mock_registry():
@@ -18,6 +21,7 @@ def java_test_file(tmp_path):
 
     import java.util.List;
     import java.util.ArrayList;
+    import java.util.function.*;
 
     public class Mathf extends BaseMath implements IMath {
         @Serialized
@@ -40,6 +44,7 @@ def test_java_file_builder_parses_structure(java_test_file, mock_registry):
     assert file_obj.package == "com.tostr.test"
     assert "java.util.List" in file_obj.imports
     assert "java.util.ArrayList" in file_obj.imports
+    assert "java.util.function.*" in file_obj.imports
     assert file_obj.body.strip().startswith("package com.tostr.test;")
     
     assert mock_registry.add_struct.call_count == 3
@@ -52,4 +57,38 @@ def test_java_file_builder_parses_structure(java_test_file, mock_registry):
     
     assert class_struct.name == "Mathf"
     assert method_struct.name == "angleWrap"
-    assert field_struct.name == "TAU"
\ No newline at end of file
+    assert field_struct.name == "TAU"
+
+def test_java_file_builder_reuses_tree_for_identical_source():
+    source = b"class Cached { void ping() {} }"
+    
+    first_tree = JavaFileBuilder.parse_source(source)
+    second_tree = JavaFileBuilder.parse_source(source)
+    changed_tree = JavaFileBuilder.parse_source(source + b"\n")
+    
+    assert first_tree is second_tree
+    assert changed_tree is not first_tree
+
+def test_java_file_builder_reparses_edited_file_incrementally(tmp_path, monkeypatch):
+    path = tmp_path / "Edited.java"
+    source = b"class Edited {\n    int ping() { return 1; }\n}\n"
+    edited_source = source.replace(b"return 1;", b"return ping() + 2;")
+    
+    # Record the edits handed to tree-sitter, to tell an incremental reparse from a fresh one
+    edits = []
+    real_source_edit = java_builders._source_edit
+    def recording_source_edit(old, new):
+        edits.append((old, new))
+        return real_source_edit(old, new)
+    monkeypatch.setattr(java_builders, "_source_edit", recording_source_edit)
+    
+    original_tree = JavaFileBuilder.parse_source(source, path)
+    original_text = str(original_tree.root_node)
+    edited_tree = JavaFileBuilder.parse_source(edited_source, path)
+    
+    # The edited source was reparsed from the previous tree, which the path now maps to the new one
+    assert edits == [(source, edited_source)]
+    assert JavaFileBuilder._path_trees[str(path.resolve())] == (edited_source, edited_tree)
+    # Same tree a fresh parse gives, and the cached original is left untouched
+    assert str(edited_tree.root_node) == str(Parser(JAVA_LANGUAGE).parse(edited_source).root_node)
+    assert str(original_tree.root_node) == original_text
@@ -92,4 +92,37 @@ def test_java_method_builder_extracts_complex_method(java_parser, mock_registry,
     
     # Check empty parameter UID
     expected_simple_uid = "src/main/java/com/tostr/Mathf.java#Mathf.ping()"
-    assert simple_obj.uid == expected_simple_uid, f"Expected {expected_simple_uid}, got {simple_obj.uid}"
\ No newline at end of file
+    assert simple_obj.uid == expected_simple_uid, f"Expected {expected_simple_uid}, got {simple_obj.uid}"
+
+def test_java_method_builder_decodes_body_on_first_access(java_parser, mock_registry, mock_parent_class):
+    tree = java_parser.parse(b"class Mathf { void ping() {} }")
+    method_node = tree.root_node.children[0].child_by_field_name('body').named_children[0]
+    
+    method_obj = JavaMethodBuilder(mock_registry).from_node(method_node, parent=mock_parent_class)
+    
+    # Nothing is decoded at build time; body reads the node's text on first access and keeps it
+    assert method_obj._body == ""
+    assert method_obj.body == "void ping() {}"
+    assert method_obj._body == "void ping() {}"
+
+def test_java_method_builder_collects_dependencies(java_parser, mock_registry, mock_parent_class):
+    java_code = """
+    class Mathf {
+        int clamp(int value, int max) {
+            log("clamp");
+            log("bounds");
+            return Math.min(value, Math.max(0, max));
+        }
+    }
+    """
+    tree = java_parser.parse(java_code.encode("utf-8"))
+    body_node = tree.root_node.children[0].child_by_field_name('body')
+    method_node = next(child for child in body_node.children if child.type == "method_declaration")
+    
+    method_obj = JavaMethodBuilder(mock_registry).from_node(method_node, parent=mock_parent_class)
+    
+    # Invocations must not leak into the method's own name and arity
+    assert method_obj.name == "clamp"
+    assert method_obj.arity == 2
+    # Repeated call targets are listed once, in first-call order
+    assert method_obj.dependency_names == [("log", 1), ("min", 2), ("max", 2)]
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+
+from tostr.core.registry import Registry
+from tostr.languages.java.builders import JavaFileBuilder
+from tostr.llm.gemini import GeminiClient
+
+@pytest.fixture
+def client():
+    # no network: the request itself is stubbed per test
+    return GeminiClient.__new__(GeminiClient)
+
+@pytest.fixture
+def java_classes(tmp_path):
+    java_file = tmp_path / "Pair.java"
+    java_file.write_text("class A { void a() {} }\nclass B { void b1() {} void b2() {} }\n")
+    file_obj = JavaFileBuilder(Registry(use_cache=False, project_path=tmp_path)).from_path(java_file)
+    return sorted(file_obj.classes, key=lambda c: c.name)
+
+def test_gemini_batch_routes_results_by_uid(client, java_classes):
+    a, b = java_classes
+    
+    async def fake_generate_json(input_data, system_instruction, schema, label):
+        ids = {c["uid"]: list(c["method_ids_to_signatures"]) for c in input_data["classes"]}
+        # Answered out of order, plus an entry under a uid that was never asked for
+        return {"classes": [
+            {"uid": b.uid, "description": "dB", "methods": [{"method_id": i, "description": f"mB{i}"} for i in ids[b.uid]]},
+            {"uid": "Pair.java#Z", "description": "dZ", "methods": []},
+            {"uid": a.uid, "description": "dA", "methods": [{"method_id": i, "description": f"mA{i}"} for i in ids[a.uid]]},
+        ]}
+    client._generate_json = fake_generate_json
+    
+    responses = asyncio.run(client.generate_descriptions_batch([a, b]))
+    
+    assert [r["uid"] for r in responses] == [a.uid, b.uid]
+    # Method ids are unique across the batch and map back to the right method
+    assert [m["uid"] for m in responses[0]["methods"]] == [m.uid for m in a.methods]
+    assert sorted(m["uid"] for m in responses[1]["methods"]) == sorted(m.uid for m in b.methods)
+
+def test_gemini_batch_returns_none_for_missing_class(client, java_classes):
+    a, b = java_classes
+    
+    async def fake_generate_json(input_data, system_instruction, schema, label):
+        return {"classes": [{"uid": a.uid, "description": "dA", "methods": []}]}
+    client._generate_json = fake_generate_json
+    
+    responses = asyncio.run(client.generate_descriptions_batch([a, b]))
+    
+    assert responses[0]["description"] == "dA"
+    assert responses[1] is None
+
+def test_gemini_batch_isolates_payload_and_request_failures(client, java_classes):
+    a, b = java_classes
+    # without its node a class cannot be skeletonized
+    a.node = None
+    sent = []
+    
+    async def fake_generate_json(input_data, system_instruction, schema, label):
+        sent.append([c["uid"] for c in input_data["classes"]])
+        raise RuntimeError("500 internal")
+    client._generate_json = fake_generate_json
+    
+    responses = asyncio.run(client.generate_descriptions_batch([a, b]))
+    
+    assert sent == [[b.uid]]
+    assert responses[0]["status"] == "error"
+    # A failed request leaves the class unanswered, so the caller can retry it alone
+    assert responses[1] is None